@@ -0,0 +1,75 @@
+"""
+Helpers shared by the news fetching and article generation scripts.
+
+Both scripts talk to EventRegistry and keep their state in small JSON files,
+so the client setup and the atomic file write live here.
+"""
+
+import os
+from typing import Tuple, Union
+
+
+def make_event_registry(api_key: str, timeout: Union[float, Tuple[float, float]], retries: int):
+    """
+    Create an EventRegistry client with bounded HTTP timeouts and retries.
+    
+    The SDK posts every request with a fixed 60 second timeout and by default
+    repeats failed requests forever, so both are bounded here at the HTTP
+    layer; a stalled request then fails with requests' Timeout error.
+    
+    The timeout is applied by wrapping the SDK's private _reqSession.post,
+    which was checked against eventregistry 10.0 (pinned in requirements.txt).
+    
+    Args:
+        api_key (str): EventRegistry API key.
+        timeout: Timeout for each HTTP request in seconds, or a
+            (connect, read) tuple as accepted by requests.
+        retries (int): Number of times a failed request is repeated.
+    
+    Returns:
+        EventRegistry: Configured client.
+    
+    Raises:
+        RuntimeError: If the SDK no longer has the session this relies on.
+    """
+    # Imported here so callers that never reach the API skip loading the SDK
+    from eventregistry import EventRegistry
+    
+    er = EventRegistry(apiKey=api_key, repeatFailedRequestCount=retries)
+    session = getattr(er, '_reqSession', None)
+    post = getattr(session, 'post', None)
+    if not callable(post):
+        # Fail loudly rather than silently run without a timeout
+        raise RuntimeError("EventRegistry client has no _reqSession.post, so the request "
+                           "timeout cannot be applied; check the pinned eventregistry version")
+    
+    def post_with_timeout(url, **kwargs):
+        kwargs['timeout'] = timeout
+        return post(url, **kwargs)
+    
+    session.post = post_with_timeout
+    return er
+
+
+def write_file_atomic(file_path: str, payload: str) -> None:
+    """
+    Replace a file's contents atomically.
+    
+    The payload goes to a temporary file next to the target, which is then
+    renamed over it, so an interrupted run never leaves a truncated file.
+    
+    Args:
+        file_path (str): File to write.
+        payload (str): Complete new contents.
+    """
+    tmp_path = f"{file_path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
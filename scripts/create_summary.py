@@ -11,13 +11,56 @@ import sys
 import json
 import argparse
 import re
+import textwrap
 from datetime import datetime
+from functools import lru_cache
+
+# Sentence boundary: terminal punctuation followed by a space or newline
+_SENTENCE_END_RE = re.compile(r'[.!?][ \n]')
+_NONSPACE_RE = re.compile(r'\S')
+
+# Topic keywords that mark a paragraph as worth quoting in the thread
+_RELEVANCE_RE = re.compile(r'mining|bitcoin|hashrate|blockchain|cryptocurrency', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _get_wrapper(width):
+    """Return a shared greedy word wrapper for the given chunk width."""
+    # No tab expansion, so each wrapped line keeps its length in the source text
+    return textwrap.TextWrapper(width=width, break_long_words=True,
+                                break_on_hyphens=False, expand_tabs=False)
+
+
+def _last_sentence_end(text, lo, hi):
+    """
+    Return the offset just past the last sentence ending in text[lo:hi].
+    
+    Uses plain substring scans instead of the regex engine, so one call per
+    chunk replaces matching every sentence boundary.
+    
+    Args:
+        text (str): Text being split.
+        lo (int): Start of the search window.
+        hi (int): End of the search window; the mark's whitespace must fit.
+    
+    Returns:
+        int: Offset after the terminal punctuation, or 0 if none was found.
+    """
+    # Bound method and unrolled marks: no generator frame or attribute
+    # lookups per scan on this per-chunk path
+    rfind = text.rfind
+    return max(rfind('. ', lo, hi), rfind('! ', lo, hi), rfind('? ', lo, hi),
+               rfind('.\n', lo, hi), rfind('!\n', lo, hi), rfind('?\n', lo, hi)) + 1
 
 
 def split_text_for_twitter(text, max_length=280):
     """
     Split text into Twitter-compatible chunks.
     
+    Sentences are packed greedily: each chunk ends at the last sentence
+    boundary that still fits, found with reverse substring scans, and is a
+    slice of the original text.
+    
     Args:
         text (str): Text to split.
         max_length (int): Maximum characters per tweet (default: 280).
@@ -27,38 +70,36 @@ def split_text_for_twitter(text, max_length=280):
     """
     # Reserve space for thread numbering (e.g., "1/5 ")
     effective_length = max_length - 10
-    
-    # Split by sentences first
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    
+    text = text.strip()
+    length = len(text)
+
     chunks = []
-    current_chunk = ""
-    
-    for sentence in sentences:
-        # If adding this sentence would exceed the limit
-        if len(current_chunk) + len(sentence) + 1 > effective_length:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
+    # Start of the chunk being built, and the offset it must extend to at least
+    lo = floor = 0
+
+    while lo < length:
+        if length - lo <= effective_length:
+            chunks.append(text[lo:].rstrip())
+            break
+
+        end = _last_sentence_end(text, max(floor - 1, lo), lo + effective_length + 1)
+        if not end:
+            if floor > lo:
+                end = floor
             else:
-                # Single sentence is too long, split it
-                words = sentence.split()
-                for word in words:
-                    if len(current_chunk) + len(word) + 1 > effective_length:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                            current_chunk = word
-                        else:
-                            # Single word is too long, truncate
-                            chunks.append(word[:effective_length])
-                    else:
-                        current_chunk = f"{current_chunk} {word}".strip()
-        else:
-            current_chunk = f"{current_chunk} {sentence}".strip()
-    
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-    
+                # Single sentence is too long, wrap it on word boundaries; the last
+                # line stays open so following sentences can still be packed after it
+                boundary = _SENTENCE_END_RE.search(text, lo)
+                end = boundary.start() + 1 if boundary else length
+                lines = _get_wrapper(effective_length).wrap(text[lo:end])
+                chunks.extend(line.rstrip() for line in lines[:-1])
+                lo, floor = end - len(lines[-1]), end
+                continue
+
+        chunks.append(text[lo:end].rstrip())
+        next_sentence = _NONSPACE_RE.search(text, end)
+        lo = floor = next_sentence.start() if next_sentence else length
+
     return chunks
 
 
@@ -91,25 +132,33 @@ def create_twitter_thread(article_data, max_tweets=10):
     
     # Create summary of key points
     if key_points:
-        key_points_text = "Key takeaways:\n\n" + "\n".join([f"• {point}" for point in key_points[:4]])
-        key_points_chunks = split_text_for_twitter(key_points_text)
-        tweets.extend(key_points_chunks[:2])  # Limit key points to 2 tweets max
+        key_points_text = "Key takeaways:\n\n" + "\n".join(f"• {point}" for point in key_points[:4])
+        if len(key_points_text) <= 270:
+            # Common case: fits in a single tweet, no splitting needed
+            tweets.append(key_points_text.rstrip())
+        else:
+            key_points_chunks = split_text_for_twitter(key_points_text)
+            tweets.extend(key_points_chunks[:2])  # Limit key points to 2 tweets max
     
     # Extract interesting excerpts from content
-    content_paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+    # Strip each paragraph once; the relevance regex is case-insensitive,
+    # so no lowercased copy is needed
+    content_paragraphs = [p for p in map(str.strip, content.split('\n\n')) if p]
     
-    # Find the most informative paragraphs (avoiding introduction/conclusion)
-    informative_paragraphs = []
-    for para in content_paragraphs[1:-1]:  # Skip first and last paragraphs
-        if len(para) > 100 and any(keyword in para.lower() for keyword in 
-                                  ['mining', 'bitcoin', 'hashrate', 'blockchain', 'cryptocurrency']):
-            informative_paragraphs.append(para)
+    # Find the most informative paragraphs (avoiding introduction/conclusion);
+    # lazily, so paragraphs past the tweet budget are never examined
+    informative_paragraphs = (
+        para for para in content_paragraphs[1:-1]  # Skip first and last paragraphs
+        if len(para) > 100 and _RELEVANCE_RE.search(para)
+    )
     
     # Add selected content chunks
     remaining_tweets = max_tweets - len(tweets) - 1  # Reserve last tweet for conclusion
     content_tweets = 0
     
-    for para in informative_paragraphs[:remaining_tweets]:
+    for para in informative_paragraphs:
+        if content_tweets >= remaining_tweets:
+            break
         para_chunks = split_text_for_twitter(para)
         if content_tweets + len(para_chunks) <= remaining_tweets:
             tweets.extend(para_chunks)
@@ -128,23 +177,123 @@ def create_twitter_thread(article_data, max_tweets=10):
     tweets.append(final_tweet)
     
     # Number the tweets
-    numbered_tweets = []
     total = len(tweets)
+    if total == 1:
+        return tweets
+    return [f"{i}/{total} {tweet}" for i, tweet in enumerate(tweets, 1)]
+
+
+def build_thread_output(article_data, tweets, created_at=None):
+    """
+    Build the JSON payload describing a thread and its source article.
     
-    for i, tweet in enumerate(tweets, 1):
-        if total > 1:
-            numbered_tweet = f"{i}/{total} {tweet}"
-        else:
-            numbered_tweet = tweet
-        numbered_tweets.append(numbered_tweet)
+    Args:
+        article_data (dict): Article the thread was created from.
+        tweets (list): Numbered tweets of the thread.
+        created_at (str): ISO timestamp to record; defaults to now. Batch
+            runs pass one timestamp shared by every thread.
+    
+    Returns:
+        dict: Serializable thread document.
+    """
+    return {
+        'thread': tweets,
+        'total_tweets': len(tweets),
+        'created_at': created_at or datetime.now().isoformat(),
+        'source_article': {
+            'headline': article_data.get('headline', ''),
+            'generated_at': article_data.get('generated_at', ''),
+            'source_event_uri': article_data.get('source_event_uri', '')
+        }
+    }
+
+
+def create_threads_from_dir(input_dir, max_tweets):
+    """
+    Create threads for every ``*.json`` article in a directory.
+    
+    All articles are handled in this single process, so batch runs avoid
+    paying interpreter startup and imports once per article.
+    
+    Args:
+        input_dir (str): Directory containing generated article JSON files.
+        max_tweets (int): Maximum number of tweets per thread.
+    
+    Returns:
+        list: (file_name, article_data, tweets) tuples, in file name order.
+            Unreadable articles are reported on stderr and skipped.
+    """
+    results = []
+    for file_name in sorted(os.listdir(input_dir)):
+        if not file_name.endswith('.json'):
+            continue
+        path = os.path.join(input_dir, file_name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                article_data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+        
+        tweets = create_twitter_thread(article_data, max_tweets)
+        if not tweets:
+            print(f"Skipping {path}: failed to create Twitter thread.", file=sys.stderr)
+            continue
+        results.append((file_name, article_data, tweets))
+    
+    return results
+
+
+def write_thread_output(out, tweets, output_data=None):
+    """
+    Write the thread to an open text stream.
     
-    return numbered_tweets
+    Args:
+        out: Writable text stream (file handle or sys.stdout).
+        tweets (list): Numbered tweets of the thread.
+        output_data (dict): JSON payload to serialize; when None the thread
+            is written in plain text format for easy copy-paste.
+    """
+    if output_data is not None:
+        # Encode straight into the stream instead of building the whole string
+        json.dump(output_data, out, indent=2, ensure_ascii=False)
+        out.write("\n")
+    else:
+        for i, tweet in enumerate(tweets, 1):
+            out.write(f"Tweet {i}:\n{tweet}\n\n")
+
+
+def write_batch_output(out, results, as_json):
+    """
+    Write the threads created in batch mode to an open text stream.
+    
+    Args:
+        out: Writable text stream (file handle or sys.stdout).
+        results (list): (file_name, article_data, tweets) tuples.
+        as_json (bool): Write a JSON array of thread documents instead of
+            plain text sections.
+    """
+    if as_json:
+        created_at = datetime.now().isoformat()
+        documents = []
+        for file_name, article_data, tweets in results:
+            document = build_thread_output(article_data, tweets, created_at)
+            document['source_file'] = file_name
+            documents.append(document)
+        write_thread_output(out, None, documents)
+    else:
+        for file_name, _, tweets in results:
+            out.write(f"=== {file_name} ===\n\n")
+            write_thread_output(out, tweets)
 
 
 def main():
     """Main function to create Twitter thread summary from article."""
     parser = argparse.ArgumentParser(description='Create Twitter thread summary from article')
-    parser.add_argument('article_file', help='JSON file containing the generated article')
+    parser.add_argument('article_file', nargs='?',
+                       help='JSON file containing the generated article')
+    parser.add_argument('--input-dir',
+                       help='Create threads for every *.json article in this directory')
     parser.add_argument('--max-tweets', type=int, default=8,
                        help='Maximum number of tweets in thread (default: 8)')
     parser.add_argument('--output', help='Output file path (default: stdout)')
@@ -153,6 +302,28 @@ def main():
     
     args = parser.parse_args()
     
+    if (args.article_file is None) == (args.input_dir is None):
+        parser.error('provide either article_file or --input-dir')
+    
+    if args.input_dir:
+        if not os.path.isdir(args.input_dir):
+            print(f"Error: Input directory '{args.input_dir}' not found.", file=sys.stderr)
+            sys.exit(1)
+        
+        results = create_threads_from_dir(args.input_dir, args.max_tweets)
+        if not results:
+            print("No Twitter threads created.", file=sys.stderr)
+            sys.exit(1)
+        
+        as_json = args.format == 'json'
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                write_batch_output(f, results, as_json)
+            print(f"{len(results)} Twitter threads saved to: {args.output}", file=sys.stderr)
+        else:
+            write_batch_output(sys.stdout, results, as_json)
+        return
+    
     try:
         # Load article data
         if args.article_file == '-':
@@ -170,33 +341,17 @@ def main():
         
         # Prepare output
         if args.format == 'json':
-            output_data = {
-                'thread': tweets,
-                'total_tweets': len(tweets),
-                'created_at': datetime.now().isoformat(),
-                'source_article': {
-                    'headline': article_data.get('headline', ''),
-                    'generated_at': article_data.get('generated_at', ''),
-                    'source_event_uri': article_data.get('source_event_uri', '')
-                }
-            }
-            output_content = json.dumps(output_data, indent=2, ensure_ascii=False)
+            output_data = build_thread_output(article_data, tweets)
         else:
-            # Text format for easy copy-paste
-            output_lines = []
-            for i, tweet in enumerate(tweets, 1):
-                output_lines.append(f"Tweet {i}:")
-                output_lines.append(tweet)
-                output_lines.append("")  # Empty line between tweets
-            output_content = "\n".join(output_lines)
+            output_data = None
         
         # Output result
         if args.output:
             with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(output_content)
+                write_thread_output(f, tweets, output_data)
             print(f"Twitter thread saved to: {args.output}", file=sys.stderr)
         else:
-            print(output_content)
+            write_thread_output(sys.stdout, tweets, output_data)
             
     except FileNotFoundError:
         print(f"Error: Article file '{args.article_file}' not found.", file=sys.stderr)
@@ -10,13 +10,43 @@ a queue system to prevent reprocessing of events.
 import os
 import sys
 import json
+import time
+import queue
+import hashlib
 import argparse
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Set, Optional, Tuple
-from eventregistry import EventRegistry, QueryEvents, RequestEventsInfo, QueryEventsIter, QueryItems, QueryArticlesIter, RequestArticlesInfo
+import threading
+from functools import lru_cache
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Set, Optional, Tuple, Iterator
+from eventregistry import EventRegistry, QueryArticles, RequestArticlesInfo
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from common import make_event_registry, write_file_atomic
+
+# Keyword queries are constant, so build them once at import time
+MINING_ARTICLE_KEYWORDS = "Bitcoin AND (mining OR miner OR hashrate OR hash rate OR ASIC)"
+
+# Shared read-only default for nested .get() lookups on API results, so a
+# missing key does not allocate a fresh empty dict every time
+EMPTY_DICT = {}
+
+# Seconds allowed to establish a connection to the API
+CONNECT_TIMEOUT = 5
+
+# Progressive fallback windows in minutes: 3 hours, 2 hours, 1 hour, 30 minutes
+FALLBACK_WINDOWS = (180, 120, 60, 30)
+
+# Idle EventRegistry clients by (api_key, timeout, retries), see event_registry_client()
+IDLE_CLIENTS: Dict[Tuple[str, int, int], List[EventRegistry]] = {}
+
+# Most fallback windows allowed to have a query in flight at the same time.
+# The API rejects too many simultaneous requests with 429, so a slow query
+# gets at most one hedge running beside it.
+MAX_PARALLEL_WINDOWS = 2
+
+# Seconds a window query may run before the next window is also started;
+# well below the default read timeout, so the hedge can still help
+HEDGE_DELAY = 10
 
 
 class APITimeoutError(Exception):
@@ -24,20 +54,32 @@ class APITimeoutError(Exception):
     pass
 
 
-def make_session(retries: int) -> requests.Session:
-    """Create a requests session with retry logic for better resilience."""
-    s = requests.Session()
-    retry = Retry(
-        total=retries,
-        backoff_factor=1.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=("GET", "POST"),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    s.mount("https://", adapter)
-    s.mount("http://", adapter)
-    return s
+@contextmanager
+def event_registry_client(api_key: str, timeout: int, retries: int) -> Iterator[EventRegistry]:
+    """
+    Borrow an idle EventRegistry client, creating one if none is free.
+    
+    Reusing clients keeps their HTTP keep-alive connection, so later fallback
+    queries skip the TCP and TLS handshakes. A client serializes its requests
+    behind a lock, so concurrent queries each borrow their own client.
+    
+    Args:
+        api_key (str): EventRegistry API key.
+        timeout (int): Read timeout for each HTTP request in seconds.
+        retries (int): Number of times a failed request is repeated.
+    
+    Yields:
+        EventRegistry: Client for exclusive use until the block exits.
+    """
+    idle = IDLE_CLIENTS.setdefault((api_key, timeout, retries), [])
+    try:
+        er = idle.pop()
+    except IndexError:
+        er = make_event_registry(api_key, (CONNECT_TIMEOUT, timeout), retries)
+    try:
+        yield er
+    finally:
+        idle.append(er)
 
 
 def load_processed_events(file_path: str = "processed_events.json") -> Set[str]:
@@ -51,10 +93,12 @@ def load_processed_events(file_path: str = "processed_events.json") -> Set[str]:
         Set[str]: Set of previously processed event URIs.
     """
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return set(data.get('processed_uris', []))
+        # Open directly rather than stat-ing first; a missing file just means
+        # nothing has been processed yet
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return set(data.get('processed_uris', []))
+    except FileNotFoundError:
         return set()
     except (json.JSONDecodeError, IOError) as e:
         print(f"Warning: Could not load processed events file: {e}", file=sys.stderr)
@@ -72,17 +116,18 @@ def load_existing_queue(file_path: str = "events.json") -> List[str]:
         List[str]: List of event URIs currently in queue.
     """
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('event_uris', [])
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('event_uris', [])
+    except FileNotFoundError:
         return []
     except (json.JSONDecodeError, IOError) as e:
         print(f"Warning: Could not load events queue file: {e}", file=sys.stderr)
         return []
 
 
-def save_events_queue(event_uris: List[str], file_path: str = "events.json", event_details_cache: Dict = None) -> None:
+def save_events_queue(event_uris: List[str], file_path: str = "events.json", event_details_cache: Dict = None,
+                      updated_at: Optional[str] = None) -> None:
     """
     Save event URIs to the queue file.
     
@@ -90,11 +135,12 @@ def save_events_queue(event_uris: List[str], file_path: str = "events.json", eve
         event_uris (List[str]): List of event URIs to save.
         file_path (str): Path to the events queue file.
         event_details_cache (Dict): Cached event details for fallback.
+        updated_at (Optional[str]): ISO timestamp to record (default: now).
     """
     try:
         data = {
             'event_uris': event_uris,
-            'updated_at': datetime.now().isoformat(),
+            'updated_at': updated_at or datetime.now().isoformat(),
             'total_events': len(event_uris)
         }
         
@@ -102,8 +148,9 @@ def save_events_queue(event_uris: List[str], file_path: str = "events.json", eve
         if event_details_cache:
             data['event_details_cache'] = event_details_cache
             
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Encode in one go and hand the file a single write; json.dump would
+        # push every small encoder chunk through the text layer separately
+        write_file_atomic(file_path, json.dumps(data, indent=2, ensure_ascii=False))
         print(f"Saved {len(event_uris)} events to queue: {file_path}", file=sys.stderr)
         if event_details_cache:
             print(f"Cached details for {len(event_details_cache)} events for fallback use", file=sys.stderr)
@@ -112,43 +159,166 @@ def save_events_queue(event_uris: List[str], file_path: str = "events.json", eve
         sys.exit(1)
 
 
-def fetch_articles_simple(api_key: str, recency_minutes: int = 30, max_articles: int = 5) -> Tuple[List[str], Dict]:
+def query_cache_key(recency_minutes: int, max_articles: int) -> str:
+    """
+    Build a stable cache key for an article query.
+    
+    Args:
+        recency_minutes (int): Time window of the query in minutes.
+        max_articles (int): Maximum number of articles requested.
+    
+    Returns:
+        str: Hex digest identifying the query parameters.
+    """
+    raw = json.dumps([MINING_ARTICLE_KEYWORDS, "eng", recency_minutes, max_articles])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def load_cached_query(cache_key: str, ttl_seconds: int,
+                      file_path: str = "query_cache.json") -> Optional[Tuple[List[str], Dict]]:
+    """
+    Look up a recent result for an identical article query.
+    
+    Args:
+        cache_key (str): Key from query_cache_key().
+        ttl_seconds (int): Maximum age of a usable entry in seconds.
+        file_path (str): Path to the query cache file.
+    
+    Returns:
+        Optional[Tuple]: (List of article URIs, Dict of cached article details),
+        or None if there is no fresh entry.
+    """
+    if ttl_seconds <= 0 or not os.path.exists(file_path):
+        return None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load query cache file: {e}", file=sys.stderr)
+        return None
+    # A cache file of any other shape is treated as empty
+    entry = entries.get(cache_key) if isinstance(entries, dict) else None
+    if not isinstance(entry, dict) or time.time() - entry.get('cached_at', 0) > ttl_seconds:
+        return None
+    return entry.get('article_uris', []), entry.get('article_cache', {})
+
+
+def save_cached_query(cache_key: str, article_uris: List[str], article_cache: Dict,
+                      ttl_seconds: int, file_path: str = "query_cache.json") -> None:
     """
-    Use QueryArticlesIter for simpler, more reliable article fetching.
+    Store an article query result, dropping entries older than the TTL.
+    
+    Args:
+        cache_key (str): Key from query_cache_key().
+        article_uris (List[str]): Article URIs returned by the query.
+        article_cache (Dict): Cached article details returned by the query.
+        ttl_seconds (int): Maximum age of entries worth keeping in seconds.
+        file_path (str): Path to the query cache file.
+    """
+    now = time.time()
+    entries = {}
+    try:
+        if os.path.exists(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                entries = {key: entry for key, entry in json.load(f).items()
+                           if now - entry.get('cached_at', 0) <= ttl_seconds}
+    except (json.JSONDecodeError, IOError, AttributeError):
+        entries = {}
+    entries[cache_key] = {
+        'cached_at': now,
+        'article_uris': article_uris,
+        'article_cache': article_cache
+    }
+    try:
+        write_file_atomic(file_path, json.dumps(entries, ensure_ascii=False))
+    except IOError as e:
+        print(f"Warning: Could not save query cache file: {e}", file=sys.stderr)
+
+
+def write_json_summary(summary: Dict) -> None:
+    """
+    Write the run summary to stdout as pretty-printed JSON.
+    
+    Args:
+        summary (Dict): Summary of the fetch run for pipeline integration.
+    """
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def write_uri_lines(uris: List[str]) -> None:
+    """
+    Write event URIs to stdout, one per line, in a single write.
+    
+    Args:
+        uris (List[str]): Event URIs to output.
+    """
+    sys.stdout.write("".join(f"{uri}\n" for uri in uris))
+
+
+def fetch_articles_simple(api_key: str, recency_minutes: int = 30, max_articles: int = 5,
+                          timeout: int = 30, retries: int = 3) -> Tuple[List[str], Dict]:
+    """
+    Use a single-page article query for simpler, more reliable article fetching.
+    
+    QueryArticlesIter always downloads pages of 100 full articles, so the
+    page is requested directly and sized to what the caller needs.
     
     Args:
         api_key (str): EventRegistry API key.
         recency_minutes (int): How far back to look in minutes.
         max_articles (int): Maximum number of articles needed.
+        timeout (int): Read timeout for each HTTP request in seconds.
+        retries (int): Number of times a failed request is repeated.
     
     Returns:
         Tuple: (List of article URIs, Dict of cached article details)
+    
+    Raises:
+        APITimeoutError: If the API did not respond within the timeout.
     """
-    er = EventRegistry(apiKey=api_key)
+    # Calculate the UTC date range with plain timestamp arithmetic
+    now = time.time()
+    end_time = time.gmtime(now)
+    start_time = time.gmtime(now - recency_minutes * 60)
     
-    # Calculate date range using datetime objects (not date objects!)
-    end_date = datetime.now(timezone.utc)
-    start_date = end_date - timedelta(minutes=recency_minutes)
+    # The API filters on whole days only (the SDK sends dates as YYYY-MM-DD),
+    # so the exact window is applied to each article's UTC dateTime below;
+    # ISO timestamps in the same format compare correctly as strings
+    window_start = time.strftime('%Y-%m-%dT%H:%M:%SZ', start_time)
+    window_end = time.strftime('%Y-%m-%dT%H:%M:%SZ', end_time)
     
     print(f"Using simplified article query for last {recency_minutes} minutes...", file=sys.stderr)
-    print(f"Date range: {start_date.isoformat()} to {end_date.isoformat()}", file=sys.stderr)
+    print(f"Date range: {window_start} to {window_end}", file=sys.stderr)
     
     # Simple keyword-based query for articles
-    q = QueryArticlesIter(
-        keywords="Bitcoin AND (mining OR miner OR hashrate OR hash rate OR ASIC)",
-        dateStart=start_date,  # Use datetime object directly
-        dateEnd=end_date,      # Use datetime object directly
+    q = QueryArticles(
+        keywords=MINING_ARTICLE_KEYWORDS,
+        dateStart=window_start[:10],
+        dateEnd=window_end[:10],
         lang="eng",
         dataType=["news"],
-        isDuplicateFilter="skipDuplicates"
+        isDuplicateFilter="skipDuplicates",
+        requestedResult=RequestArticlesInfo(
+            page=1,
+            count=min(max_articles * 2, 100),  # Request only 2x what we need, API max 100
+            sortBy="date"
+        )
     )
     
     articles = []
     article_cache = {}
     
     try:
-        # Use execQuery with proper parameters
-        for article in q.execQuery(er, sortBy="date", maxItems=max_articles * 2):
+        with event_registry_client(api_key, timeout, retries) as er:
+            result = er.execQuery(q)
+        if "error" in result:
+            raise ValueError(result["error"])
+        
+        for article in (result.get('articles') or EMPTY_DICT).get('results') or []:
+            # Results are newest first, so everything from here on is too old
+            if article.get('dateTime', window_start) < window_start:
+                break
             uri = article.get('uri')
             if uri:
                 articles.append(uri)
@@ -158,7 +328,7 @@ def fetch_articles_simple(api_key: str, recency_minutes: int = 30, max_articles:
                     'body': article.get('body', ''),
                     'date': article.get('date', ''),
                     'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('title', 'Unknown')
+                    'source': (article.get('source') or EMPTY_DICT).get('title', 'Unknown')
                 }
                 
                 if len(articles) >= max_articles:
@@ -167,156 +337,35 @@ def fetch_articles_simple(api_key: str, recency_minutes: int = 30, max_articles:
         print(f"Found {len(articles)} articles via simplified query", file=sys.stderr)
         return articles, article_cache
         
+    except requests.exceptions.Timeout as e:
+        raise APITimeoutError(f"Article query timed out after {timeout}s: {e}") from e
     except Exception as e:
         print(f"Error in simplified article query: {e}", file=sys.stderr)
         return [], {}
 
 
-def build_simple_bitcoin_query(recency_minutes: int = 30, max_events: int = 5) -> QueryEvents:
+@lru_cache(maxsize=32)
+def get_fallback_windows(recency_minutes: int) -> Tuple[int, ...]:
     """
-    Build a simplified EventRegistry query for Bitcoin news when standard mining queries fail.
+    Return the progressive fallback windows to try, in order.
     
     Args:
-        recency_minutes (int): How far back to look for events in minutes.
-        max_events (int): Maximum number of events needed (to optimize API request).
+        recency_minutes (int): Originally requested window in minutes.
     
     Returns:
-        QueryEvents: Simplified query for Bitcoin events.
+        Tuple[int, ...]: Requested window followed by FALLBACK_WINDOWS,
+        without duplicates.
     """
-    # Calculate date range
-    end_date = datetime.now(timezone.utc)
-    start_date = end_date - timedelta(minutes=recency_minutes)
-    
-    # Use very simple query strategy for better API reliability
-    query = QueryEvents(
-        keywords="bitcoin",  # Single keyword for fastest search
-        dateStart=start_date,  # Use datetime object directly
-        dateEnd=end_date,      # Use datetime object directly
-        lang="eng",  # English language
-        minArticlesInEvent=1,  # Allow single-article events
-        maxArticlesInEvent=10,  # Smaller upper bound for speed
-        requestedResult=RequestEventsInfo(
-            page=1,
-            count=min(max_events * 2, 10),  # Request only 2x what we need, max 10
-            sortBy="date"  # Sort by date for most recent first
-        )
-    )
-    
-    return query
-
-
-def build_bitcoin_mining_query(recency_minutes: int = 90, max_events: int = 5) -> QueryEvents:
-    """
-    Build EventRegistry query for Bitcoin mining news events.
-    
-    Args:
-        recency_minutes (int): How far back to look for events in minutes.
-        max_events (int): Maximum number of events needed (to optimize API request).
-    
-    Returns:
-        QueryEvents: Configured query for Bitcoin mining events.
-    """
-    # Calculate date range
-    end_date = datetime.now(timezone.utc)
-    start_date = end_date - timedelta(minutes=recency_minutes)
-    
-    # Limit very large time windows for performance
-    max_days = 30  # Maximum 30 days for performance
-    max_minutes = max_days * 24 * 60
-    if recency_minutes > max_minutes:
-        print(f"Warning: Large time window ({recency_minutes} minutes = {recency_minutes//1440} days). "
-              f"Limiting to {max_days} days for performance.", file=sys.stderr)
-        recency_minutes = max_minutes
-        start_date = end_date - timedelta(minutes=recency_minutes)
-    
-    # Use simpler keyword strategy for better performance
-    # Focus on most specific terms first
-    query = QueryEvents(
-        keywords=QueryItems.OR([
-            "bitcoin mining",    # Most specific term
-            "bitcoin miner",     # Second most specific
-            QueryItems.AND(["bitcoin", "hashrate"]),    # Bitcoin + mining indicator
-            QueryItems.AND(["bitcoin", "ASIC"]),        # Bitcoin + mining hardware
-        ]),
-        dateStart=start_date,  # Use datetime object directly
-        dateEnd=end_date,      # Use datetime object directly
-        lang="eng",  # English language
-        minArticlesInEvent=1,  # Allow single-article events
-        maxArticlesInEvent=20,  # Reduced upper bound for performance
-        requestedResult=RequestEventsInfo(
-            page=1,
-            count=min(max_events * 3, 15),  # Request only ~3x what we need, max 15
-            sortBy="date"  # Sort by date for most recent first
-        )
-    )
-    
-    return query
-
-
-def filter_bitcoin_mining_events(events: List[Dict], exclude_other_cryptos: bool = True, max_events: int = 5) -> List[Dict]:
-    """
-    Filter events to focus on Bitcoin-only mining, excluding other cryptocurrencies.
-    Optimized to stop processing once we have enough events.
-    
-    Args:
-        events (List[Dict]): List of events from EventRegistry.
-        exclude_other_cryptos (bool): Whether to exclude other cryptocurrency mentions.
-        max_events (int): Maximum number of events needed (for early termination).
-    
-    Returns:
-        List[Dict]: Filtered events focused on Bitcoin mining.
-    """
-    # Prioritized other cryptocurrency terms to exclude (most common first)
-    exclude_crypto_terms = [
-        "ethereum", "ETH", "bitcoin cash", "BCH", "litecoin", "LTC", 
-        "dogecoin", "DOGE", "solana", "SOL", "cardano", "ADA",
-        "ripple", "XRP", "polygon", "MATIC", "avalanche", "AVAX"
-    ]
-    
-    # Essential Bitcoin mining terms (simplified for performance)
-    bitcoin_terms = ["bitcoin", "mining", "miner", "hashrate", "ASIC"]
-    
-    filtered_events = []
-    
-    for event in events:
-        # Early termination if we have enough events
-        if len(filtered_events) >= max_events * 2:  # Get 2x to allow for further filtering
-            break
-            
-        title = event.get('title', {}).get('eng', '').lower()
-        summary = event.get('summary', {}).get('eng', '').lower()
-        combined_text = f"{title} {summary}"
-        
-        # Quick Bitcoin check first (most efficient)
-        if 'bitcoin' not in combined_text:
-            continue
-            
-        # Check for mining relevance
-        has_mining_context = any(term in combined_text for term in ['mining', 'miner', 'hashrate', 'asic'])
-        if not has_mining_context:
-            continue
-        
-        # Quick exclusion check (only if needed)
-        if exclude_other_cryptos:
-            bitcoin_count = combined_text.count('bitcoin')
-            # Check only most common competing cryptos for performance
-            other_crypto_count = sum(1 for term in exclude_crypto_terms[:8] 
-                                   if term.lower() in combined_text)
-            
-            # Skip if other cryptos dominate
-            if other_crypto_count > 0 and bitcoin_count <= other_crypto_count:
-                continue
-        
-        filtered_events.append(event)
-    
-    return filtered_events
+    return tuple(dict.fromkeys((recency_minutes,) + FALLBACK_WINDOWS))
 
 
 def fetch_bitcoin_mining_events_with_fallback(api_key: Optional[str] = None,
                                              recency_minutes: int = 90,
                                              max_events: int = 5,
                                              timeout: int = 30,
-                                             retries: int = 3) -> Tuple[List[str], Dict]:
+                                             retries: int = 3,
+                                             cache_ttl: int = 0,
+                                             cache_file: str = "query_cache.json") -> Tuple[List[str], Dict]:
     """
     Fetch Bitcoin mining events with progressive fallback to smaller time windows and simpler queries.
     
@@ -324,7 +373,11 @@ def fetch_bitcoin_mining_events_with_fallback(api_key: Optional[str] = None,
         api_key (Optional[str]): EventRegistry API key.
         recency_minutes (int): Initial time window to try.
         max_events (int): Maximum number of events to fetch.
-        timeout (int): Timeout in seconds (reduced from 45 to 30).
+        timeout (int): Read timeout for each HTTP request in seconds.
+        retries (int): Number of times a failed HTTP request is repeated.
+        cache_ttl (int): Reuse results of identical queries made within this
+            many seconds (0 disables the query cache).
+        cache_file (str): Path to the query cache file.
     
     Returns:
         Tuple: (List of event URIs, Dict of cached event details)
@@ -334,37 +387,86 @@ def fetch_bitcoin_mining_events_with_fallback(api_key: Optional[str] = None,
         if not api_key:
             raise ValueError("EventRegistry API key not provided. Set EVENTREGISTRY_API_KEY environment variable.")
     
-    # Progressive fallback windows (in minutes)
-    fallback_windows = [
-        recency_minutes,  # Original requested window
-        180,  # 3 hours
-        120,  # 2 hours  
-        60,   # 1 hour
-        30,   # 30 minutes
-    ]
+    fallback_windows = get_fallback_windows(recency_minutes)
     
-    # Remove duplicates while preserving order
-    fallback_windows = list(dict.fromkeys(fallback_windows))
+    # Windows are hedged rather than tried strictly one after another: the
+    # next window starts as soon as the current one comes back empty or
+    # failed, or when it is still running after HEDGE_DELAY seconds. A slow
+    # query therefore no longer holds up the fallbacks, while a fast
+    # successful first query still costs a single API request. Results are
+    # used in fallback order, so a hedge never beats an earlier window that
+    # is still running.
+    results = queue.Queue()
     
-    # Try the simplified article query approach first (more reliable)
-    for window_minutes in fallback_windows:
+    def run_window(window_minutes: int) -> None:
         try:
-            print(f"Attempting simplified article query with {window_minutes} minute window...", file=sys.stderr)
-            
-            # Use the new simplified article fetcher
-            article_uris, article_cache = fetch_articles_simple(api_key, window_minutes, max_events)
-            
+            results.put((window_minutes,
+                         fetch_articles_simple(api_key, window_minutes, max_events, timeout, retries),
+                         None))
+        except Exception as e:
+            results.put((window_minutes, None, e))
+    
+    outcomes = {}  # Finished windows: window -> (result, error, from cache)
+    started = 0    # Windows started (or answered from the cache), in order
+    decided = 0    # Windows whose outcome has been used, in order
+    in_flight = 0
+    hedge_due = False
+    last_error = None
+    
+    while decided < len(fallback_windows):
+        # Use finished windows in order; the first window with articles wins
+        window_minutes = fallback_windows[decided]
+        if window_minutes in outcomes:
+            result, error, from_cache = outcomes.pop(window_minutes)
+            decided += 1
+            if error is not None:
+                print(f"Query failed with {window_minutes} minutes: {error}", file=sys.stderr)
+                last_error = error
+                continue
+            article_uris, article_cache = result
             if article_uris:
                 print(f"Successfully found {len(article_uris)} articles", file=sys.stderr)
+                if cache_ttl > 0 and not from_cache:
+                    save_cached_query(query_cache_key(window_minutes, max_events),
+                                      article_uris, article_cache, cache_ttl, cache_file)
                 return article_uris, article_cache
-            else:
-                print(f"No articles found in {window_minutes} minute window", file=sys.stderr)
-                
-        except Exception as e:
-            print(f"Query failed with {window_minutes} minutes: {e}", file=sys.stderr)
-            if window_minutes == fallback_windows[-1]:
-                print(f"All fallback attempts failed.", file=sys.stderr)
-                raise APITimeoutError("All progressive fallback attempts failed")
+            print(f"No articles found in {window_minutes} minute window", file=sys.stderr)
+            continue
+        
+        # Start the next window once nothing is running, or as a hedge beside
+        # a slow query
+        if started < len(fallback_windows) and (not in_flight or hedge_due):
+            hedge_due = False
+            window_minutes = fallback_windows[started]
+            started += 1
+            cached = load_cached_query(query_cache_key(window_minutes, max_events), cache_ttl, cache_file)
+            if cached and cached[0]:
+                print(f"Using cached results for {window_minutes} minute window", file=sys.stderr)
+                outcomes[window_minutes] = (cached, None, True)
+                continue
+            
+            print(f"Attempting simplified article query with {window_minutes} minute window...", file=sys.stderr)
+            # Daemon threads, so a straggling query cannot delay process exit
+            threading.Thread(target=run_window, args=(window_minutes,), daemon=True).start()
+            in_flight += 1
+            continue
+        
+        try:
+            window_minutes, result, error = results.get(timeout=HEDGE_DELAY)
+        except queue.Empty:
+            # No hedge once a later window has already found articles; it
+            # is used if the slow earlier window comes back empty
+            found = any(result and result[0] for result, _, _ in outcomes.values())
+            if started < len(fallback_windows) and in_flight < MAX_PARALLEL_WINDOWS and not found:
+                print(f"Query still running after {HEDGE_DELAY}s, starting next fallback window", file=sys.stderr)
+                hedge_due = True
+            continue
+        in_flight -= 1
+        outcomes[window_minutes] = (result, error, False)
+    
+    if last_error is not None:
+        print(f"All fallback attempts failed.", file=sys.stderr)
+        raise APITimeoutError("All progressive fallback attempts failed")
     
     return [], {}
 
@@ -418,6 +520,12 @@ def main():
                        help='Number of retries on timeout/5xx')
     parser.add_argument('--test-mode', action='store_true',
                        help='Run in test mode with sample data (no API calls)')
+    parser.add_argument('--cache-ttl', type=int, default=0,
+                       help='Reuse results of identical API queries made within this many seconds (default: 0, disabled)')
+    parser.add_argument('--cache-file', default='query_cache.json',
+                       help='File storing cached API query results (default: query_cache.json)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Log each fetched event skipped as already processed or queued')
     
     args = parser.parse_args()
     
@@ -442,6 +550,9 @@ def main():
             args.max_articles = 10
             print(f"Fast mode: Reduced max articles from {original_max} to 10", file=sys.stderr)
     
+    # One timestamp for the whole run, shared by the queue file and the summary
+    fetch_time = datetime.now().isoformat()
+    
     try:
         # Load existing processed events for deduplication
         processed_events = set()
@@ -477,7 +588,9 @@ def main():
                     recency_minutes=args.recency_minutes,
                     max_events=args.max_articles,
                     timeout=args.timeout,
-                    retries=args.retries
+                    retries=args.retries,
+                    cache_ttl=args.cache_ttl,
+                    cache_file=args.cache_file
                 )
             except APITimeoutError:
                 print("All progressive fallback attempts failed - falling back to existing queue if available", file=sys.stderr)
@@ -489,8 +602,7 @@ def main():
                 # For uris format, output existing queue URIs if no new events
                 if existing_queue:
                     print("Using existing events from queue", file=sys.stderr)
-                    for uri in existing_queue:
-                        print(uri)
+                    write_uri_lines(existing_queue)
                     return
                 else:
                     print("No existing events in queue either", file=sys.stderr)
@@ -501,20 +613,30 @@ def main():
                 summary = {
                     'new_events_added': 0,
                     'total_events_in_queue': len(existing_queue),
-                    'fetch_time': datetime.now().isoformat(),
+                    'fetch_time': fetch_time,
                     'new_event_uris': [],
                     'existing_queue_uris': existing_queue
                 }
-                print(json.dumps(summary, indent=2))
+                write_json_summary(summary)
                 return
         
-        # Deduplicate against processed events and existing queue
+        # Deduplicate against processed events and existing queue in one pass;
+        # accepted URIs join the queued set, which also drops repeats within
+        # the fetched batch while keeping its order
         unique_new_events = []
+        skipped_uris = []
         for uri in new_event_uris:
-            if uri not in processed_events and uri not in existing_queue_set:
-                unique_new_events.append(uri)
+            if uri in processed_events or uri in existing_queue_set:
+                skipped_uris.append(uri)
             else:
-                print(f"Skipping already processed/queued event: {uri}", file=sys.stderr)
+                existing_queue_set.add(uri)
+                unique_new_events.append(uri)
+        
+        if skipped_uris:
+            print(f"Skipping {len(skipped_uris)} already processed/queued events", file=sys.stderr)
+            if args.verbose:
+                for uri in skipped_uris:
+                    print(f"Skipping already processed/queued event: {uri}", file=sys.stderr)
         
         if not unique_new_events:
             print("All fetched events were already processed or queued", file=sys.stderr)
@@ -522,8 +644,7 @@ def main():
                 # For uris format, output existing queue URIs if no new unique events
                 if existing_queue:
                     print("Using existing events from queue", file=sys.stderr)
-                    for uri in existing_queue:
-                        print(uri)
+                    write_uri_lines(existing_queue)
                     return
                 else:
                     print("No events available in queue", file=sys.stderr)
@@ -534,20 +655,23 @@ def main():
                 summary = {
                     'new_events_added': 0,
                     'total_events_in_queue': len(existing_queue),
-                    'fetch_time': datetime.now().isoformat(),
+                    'fetch_time': fetch_time,
                     'new_event_uris': [],
                     'existing_queue_uris': existing_queue
                 }
-                print(json.dumps(summary, indent=2))
+                write_json_summary(summary)
                 return
         
         # Combine with existing queue and save
-        updated_queue = existing_queue + unique_new_events
+        # existing_queue is not needed on its own past this point, so grow it
+        # in place instead of copying it into a new list
+        existing_queue.extend(unique_new_events)
+        updated_queue = existing_queue
         
         # Filter the cache to only include events we're actually saving
-        filtered_cache = {uri: event_details_cache.get(uri, {}) for uri in unique_new_events if uri in event_details_cache}
+        filtered_cache = {uri: event_details_cache[uri] for uri in unique_new_events if uri in event_details_cache}
         
-        save_events_queue(updated_queue, args.output, filtered_cache)
+        save_events_queue(updated_queue, args.output, filtered_cache, fetch_time)
         
         print(f"✅ Added {len(unique_new_events)} new events to queue", file=sys.stderr)
         print(f"📊 Total events in queue: {len(updated_queue)}", file=sys.stderr)
@@ -555,17 +679,16 @@ def main():
         # Output based on format
         if args.output_format == 'uris':
             # For uris format, output all URIs in the queue (one per line)
-            for uri in updated_queue:
-                print(uri)
+            write_uri_lines(updated_queue)
         else:
             # Default JSON format for pipeline integration
             summary = {
                 'new_events_added': len(unique_new_events),
                 'total_events_in_queue': len(updated_queue),
-                'fetch_time': datetime.now().isoformat(),
+                'fetch_time': fetch_time,
                 'new_event_uris': unique_new_events
             }
-            print(json.dumps(summary, indent=2))
+            write_json_summary(summary)
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
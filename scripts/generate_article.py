@@ -13,11 +13,16 @@ import re
 import sys
 import signal
 import argparse
+import hashlib
 import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-from eventregistry import EventRegistry, QueryEvent, RequestEventInfo
-import google.generativeai as genai
+from common import make_event_registry, write_file_atomic
+# eventregistry and google.genai take most of the startup time, so they
+# are imported where the API clients are used; test mode never loads them
 
 # --- Constants and Configuration ---
 # File paths
@@ -25,8 +30,44 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 EVENTS_FILE = os.path.join(BASE_DIR, 'events.json')
 PROCESSED_EVENTS_FILE = os.path.join(BASE_DIR, 'processed_events.json')
 FAILED_EVENTS_FILE = os.path.join(BASE_DIR, 'failed_events.json')
+ARTICLE_CACHE_FILE = os.path.join(BASE_DIR, 'gemini_cache.json')
+EVENT_INFO_CACHE_FILE = os.path.join(BASE_DIR, 'event_cache.json')
 ARTICLES_DIR = os.path.join(BASE_DIR, 'articles')
 
+# Filename sanitizing: whitespace runs become '-', only [a-z0-9_-] are kept
+_WHITESPACE_RE = re.compile(r'\s+')
+_FILENAME_INVALID_RE = re.compile(r'[^a-z0-9\-_]+')
+
+# Decoder for the JSON object embedded in Gemini responses
+_JSON_DECODER = json.JSONDecoder()
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
+GEMINI_MODEL = 'gemini-pro'
+
+# Gemini retry backoff: calls in total (including the first), first and
+# maximum delay in seconds
+GEMINI_RETRY_ATTEMPTS = 6
+GEMINI_RETRY_INITIAL = 1.0
+GEMINI_RETRY_MAXIMUM = 30.0
+
+# Seconds a single Gemini request may take; the SDK waits forever by default
+GEMINI_REQUEST_TIMEOUT = 120
+
+# Gemini requests per minute allowed by the API key's quota
+GEMINI_QPM = 60
+
+# Cached Gemini articles are kept for a week, at most this many of them
+ARTICLE_CACHE_TTL = 7 * 86400
+ARTICLE_CACHE_MAX_ENTRIES = 200
+
+# EventRegistry HTTP timeouts (connect, read) in seconds and how often the SDK
+# repeats a failed request; its defaults are 60 seconds and forever
+EVENT_REGISTRY_TIMEOUT = (5, 25)
+EVENT_REGISTRY_RETRIES = 1
+
+# EventRegistry accepts at most 50 event URIs per getEvent request
+EVENT_INFO_BATCH_SIZE = 50
+
 # Load API keys from .env file
 load_dotenv()
 EVENT_REGISTRY_API_KEY = os.getenv("EVENTREGISTRY_API_KEY")
@@ -45,27 +86,27 @@ def read_json_file(file_path, default_value=None):
         return default_value if default_value is not None else []
 
 def write_json_file(file_path, data):
-    """Writes data to a JSON file."""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Writes data to a JSON file atomically, via a temp file renamed over the target."""
+    write_file_atomic(file_path, json.dumps(data, indent=2, ensure_ascii=False))
 
 def load_events_queue():
-    """Load events from the queue file in the format used by fetch_news.py."""
+    """Load event URIs and their cached details from the queue file in one read."""
     data = read_json_file(EVENTS_FILE, default_value={'event_uris': [], 'total_events': 0})
-    return data.get('event_uris', [])
+    return data.get('event_uris', []), data.get('event_details_cache', {})
 
-def load_cached_event_details():
-    """Load cached event details from the queue file."""
-    data = read_json_file(EVENTS_FILE, default_value={})
-    return data.get('event_details_cache', {})
-
-def save_events_queue(event_uris):
+def save_events_queue(event_uris, event_details_cache=None, updated_at=None):
     """Save remaining events back to the queue in the format used by fetch_news.py."""
     data = {
         'event_uris': event_uris,
-        'updated_at': datetime.now().isoformat(),
+        'updated_at': updated_at or datetime.now().isoformat(),
         'total_events': len(event_uris)
     }
+    # Keep the fallback details of events that are still queued
+    if event_details_cache:
+        remaining_cache = {uri: event_details_cache[uri] for uri in event_uris
+                           if uri in event_details_cache}
+        if remaining_cache:
+            data['event_details_cache'] = remaining_cache
     write_json_file(EVENTS_FILE, data)
 
 def load_processed_events():
@@ -73,13 +114,11 @@ def load_processed_events():
     data = read_json_file(PROCESSED_EVENTS_FILE, default_value={'processed_uris': []})
     return set(data.get('processed_uris', []))
 
-def add_processed_event(event_uri):
-    """Add an event to the processed list in the format used by fetch_news.py."""
-    processed_events = load_processed_events()
-    processed_events.add(event_uri)
+def save_processed_events(processed_events, updated_at=None):
+    """Save the processed event set in the format used by fetch_news.py."""
     data = {
         'processed_uris': list(processed_events),
-        'updated_at': datetime.now().isoformat(),
+        'updated_at': updated_at or datetime.now().isoformat(),
         'total_processed': len(processed_events)
     }
     write_json_file(PROCESSED_EVENTS_FILE, data)
@@ -89,30 +128,52 @@ def load_failed_events():
     data = read_json_file(FAILED_EVENTS_FILE, default_value={'failed_uris': []})
     return data.get('failed_uris', [])
 
-def add_failed_event(event_uri, error_message):
-    """Add an event to the failed list with error details."""
-    failed_events = load_failed_events()
-    failed_entry = {
+def make_failed_entry(event_uri, error_message):
+    """Create a failed-list entry with error details."""
+    return {
         'uri': event_uri,
         'error': str(error_message),
         'failed_at': datetime.now().isoformat()
     }
-    failed_events.append(failed_entry)
+
+def save_failed_events(failed_events, updated_at=None):
+    """Save the failed events list."""
     data = {
         'failed_uris': failed_events,
-        'updated_at': datetime.now().isoformat(),
+        'updated_at': updated_at or datetime.now().isoformat(),
         'total_failed': len(failed_events)
     }
     write_json_file(FAILED_EVENTS_FILE, data)
 
+def load_article_cache():
+    """Load generated articles cached within ARTICLE_CACHE_TTL, keyed by article_cache_key()."""
+    now = time.time()
+    entries = read_json_file(ARTICLE_CACHE_FILE, default_value={})
+    if not isinstance(entries, dict):
+        return {}
+    return {key: entry for key, entry in entries.items()
+            if isinstance(entry, dict) and 'article' in entry
+            and now - entry.get('cached_at', 0) <= ARTICLE_CACHE_TTL}
+
+def save_article_cache(article_cache):
+    """Save the newest ARTICLE_CACHE_MAX_ENTRIES cached articles."""
+    newest = sorted(article_cache.items(), key=lambda item: item[1]['cached_at'], reverse=True)
+    write_json_file(ARTICLE_CACHE_FILE, dict(newest[:ARTICLE_CACHE_MAX_ENTRIES]))
+
+def article_cache_key(event_uri, event_details):
+    """Hash an event URI with its Gemini prompt; a changed event gets a new entry."""
+    raw = f"{event_uri}\n{get_ai_prompt(event_details)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
 def write_placeholder(path="generated_article.json"):
     """Write a placeholder article when no events were processed."""
+    created_at = int(time.time())
     doc = {
         "title": "No Recent Bitcoin Mining News", 
         "headline": "No Recent Bitcoin Mining News",
         "subtitle": "The news API returned no recent Bitcoin mining events during this run.",
         "content": "We'll publish again automatically once fresh mining news becomes available.",
-        "created_at": int(time.time()),
+        "created_at": created_at,
         "generated_at": datetime.now().isoformat(),
         "body": "We'll publish again automatically once fresh mining news becomes available.",
         "key_points": [
@@ -127,100 +188,154 @@ def write_placeholder(path="generated_article.json"):
     
     # Also write to articles directory for workflow compatibility
     os.makedirs(ARTICLES_DIR, exist_ok=True)
-    article_filename = os.path.join(ARTICLES_DIR, f"placeholder-article-{int(time.time())}.json")
+    article_filename = os.path.join(ARTICLES_DIR, f"placeholder-article-{created_at}.json")
     
-    with open(path, "w") as f:
-        json.dump(doc, f, indent=2)
-    with open(article_filename, "w") as f:
-        json.dump(doc, f, indent=2)
+    # Serialize once; both copies get the same bytes
+    payload = json.dumps(doc, indent=2)
+    for output_path in (path, article_filename):
+        with open(output_path, "w") as f:
+            f.write(payload)
         
     print(f"Wrote placeholder article to {path}")
     print(f"Also wrote to {article_filename} for workflow compatibility")
 
 def sanitize_filename(headline):
     """Sanitizes a string to be a valid filename."""
-    sanitized = headline.lower()
-    sanitized = re.sub(r'\s+', '-', sanitized)
-    sanitized = re.sub(r'[^a-z0-9\-_]', '', sanitized)
+    sanitized = _WHITESPACE_RE.sub('-', headline.lower())
+    sanitized = _FILENAME_INVALID_RE.sub('', sanitized)
     return f"{sanitized[:100]}.json"
 
-def timeout_handler(signum, frame):
-    """Handle timeout for API calls."""
-    raise TimeoutError("API call timed out")
+def event_info_request():
+    """Requests only the event fields used here (title, summary, concepts)."""
+    from eventregistry import EventInfoFlags, RequestEventInfo, ReturnInfo
+    
+    # Article counts, categories, location and date are never read, so they
+    # are left out of the response
+    return RequestEventInfo(returnInfo=ReturnInfo(eventInfo=EventInfoFlags(
+        articleCounts=False, categories=False, location=False, date=False)))
 
 def fetch_event_details_with_timeout(er, event_uri, timeout_seconds=30):
     """Fetch event details with timeout and better error handling."""
-    # Set up timeout handler and store original
-    original_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(timeout_seconds)
+    from eventregistry import QueryEvent
+    
+    # Each request is bounded by the client's HTTP timeout; no further query
+    # method is tried once the overall deadline has passed
+    deadline = time.monotonic() + timeout_seconds
+    
+    def check_deadline():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"EventRegistry API call timed out after {timeout_seconds} seconds")
     
+    # Try different query methods for better compatibility
+    print(f"    Attempting to fetch details for event URI: {event_uri}")
+    
+    # Method 1: Basic query with comprehensive return info
     try:
-        # Try different query methods for better compatibility
-        print(f"    Attempting to fetch details for event URI: {event_uri}")
+        q = QueryEvent(event_uri, requestedResult=event_info_request())
+        result = er.execQuery(q)
         
-        # Method 1: Basic query with comprehensive return info
-        try:
-            q = QueryEvent(event_uri, requestedResult=RequestEventInfo())
-            result = er.execQuery(q)
+        if result and 'event' in result and result['event']:
+            print(f"    Successfully retrieved event details")
+            return result
+        else:
+            print(f"    Method 1: No event data in response")
             
-            if result and 'event' in result and result['event']:
-                print(f"    Successfully retrieved event details")
-                return result
-            else:
-                print(f"    Method 1: No event data in response")
-                
-        except Exception as e:
-            print(f"    Method 1 failed: {e}")
+    except Exception as e:
+        print(f"    Method 1 failed: {e}")
+    
+    # Method 2: Simple query without specific return info
+    check_deadline()
+    try:
+        print(f"    Trying alternative query method...")
+        q = QueryEvent(event_uri)
+        q.setRequestedResult(event_info_request())
+        result = er.execQuery(q)
         
-        # Method 2: Simple query without specific return info
+        if result and 'event' in result and result['event']:
+            print(f"    Successfully retrieved event details with method 2")
+            return result
+        else:
+            print(f"    Method 2: No event data in response")
+            
+    except Exception as e:
+        print(f"    Method 2 failed: {e}")
+    
+    # Method 3: Check if URI format needs modification
+    # Sometimes URIs need to be prefixed or have different formats
+    modified_uri = event_uri
+    if not event_uri.startswith('eng-') and not event_uri.startswith('http'):
+        modified_uri = f"eng-{event_uri}"
+        print(f"    Trying with modified URI: {modified_uri}")
+        check_deadline()
         try:
-            print(f"    Trying alternative query method...")
-            q = QueryEvent(event_uri)
-            q.setRequestedResult(RequestEventInfo())
+            q = QueryEvent(modified_uri, requestedResult=event_info_request())
             result = er.execQuery(q)
             
             if result and 'event' in result and result['event']:
-                print(f"    Successfully retrieved event details with method 2")
+                print(f"    Successfully retrieved event details with modified URI")
                 return result
             else:
-                print(f"    Method 2: No event data in response")
+                print(f"    Method 3: No event data with modified URI")
                 
         except Exception as e:
-            print(f"    Method 2 failed: {e}")
-        
-        # Method 3: Check if URI format needs modification
-        # Sometimes URIs need to be prefixed or have different formats
-        modified_uri = event_uri
-        if not event_uri.startswith('eng-') and not event_uri.startswith('http'):
-            modified_uri = f"eng-{event_uri}"
-            print(f"    Trying with modified URI: {modified_uri}")
-            try:
-                q = QueryEvent(modified_uri, requestedResult=RequestEventInfo())
-                result = er.execQuery(q)
-                
-                if result and 'event' in result and result['event']:
-                    print(f"    Successfully retrieved event details with modified URI")
-                    return result
-                else:
-                    print(f"    Method 3: No event data with modified URI")
-                    
-            except Exception as e:
-                print(f"    Method 3 failed: {e}")
-        
-        # If all methods failed, raise a descriptive error
-        raise ValueError(f"No event information found for URI '{event_uri}'. "
-                        f"This could indicate: 1) The event has expired or been removed, "
-                        f"2) The URI format is invalid, 3) API access issues, or "
-                        f"4) The event is too recent and not yet fully indexed.")
+            print(f"    Method 3 failed: {e}")
+    
+    # If all methods failed, raise a descriptive error
+    raise ValueError(f"No event information found for URI '{event_uri}'. "
+                    f"This could indicate: 1) The event has expired or been removed, "
+                    f"2) The URI format is invalid, 3) API access issues, or "
+                    f"4) The event is too recent and not yet fully indexed.")
+
+def load_event_info_cache(ttl_seconds):
+    """Load EventRegistry event info fetched within the last ttl_seconds, keyed by URI."""
+    if ttl_seconds <= 0:
+        return {}
+    now = time.time()
+    entries = read_json_file(EVENT_INFO_CACHE_FILE, default_value={})
+    if not isinstance(entries, dict):
+        return {}
+    return {uri: entry for uri, entry in entries.items()
+            if isinstance(entry, dict) and 'info' in entry
+            and now - entry.get('cached_at', 0) <= ttl_seconds}
+
+def prefetch_event_details(er, event_uris, event_info_cache=None):
+    """Fetch event info in batches of EVENT_INFO_BATCH_SIZE, one request per batch.
+
+    Returns a dict mapping each URI found to a result shaped like the one from
+    fetch_event_details_with_timeout; missing URIs fall back to per-event queries.
+    URIs in event_info_cache are not requested, and fetched ones are added to it.
+    """
+    from eventregistry import QueryEvent
+    
+    prefetched = {}
+    if event_info_cache:
+        for event_uri in event_uris:
+            if event_uri in event_info_cache:
+                prefetched[event_uri] = {'event': event_info_cache[event_uri]['info']}
+        if prefetched:
+            print(f"Using cached EventRegistry details for {len(prefetched)} events")
+    
+    uris_to_fetch = [uri for uri in event_uris if uri not in prefetched]
+    for start in range(0, len(uris_to_fetch), EVENT_INFO_BATCH_SIZE):
+        batch = uris_to_fetch[start:start + EVENT_INFO_BATCH_SIZE]
+        print(f"Fetching details for {len(batch)} events in one EventRegistry request...")
+        try:
+            result = er.execQuery(QueryEvent(batch, requestedResult=event_info_request()))
+        except Exception as e:
+            print(f"  Batch query failed ({e}), events will be fetched one by one")
+            continue
         
-    except TimeoutError:
-        raise TimeoutError(f"EventRegistry API call timed out after {timeout_seconds} seconds")
-    except Exception as e:
-        raise e
-    finally:
-        # Always cancel the alarm and restore original handler
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, original_handler)
+        # The response is keyed by event URI
+        for event_uri in batch:
+            entry = (result or {}).get(event_uri) or {}
+            event_info = entry.get('info') or entry.get('event')
+            if event_info:
+                prefetched[event_uri] = {'event': event_info}
+                if event_info_cache is not None:
+                    event_info_cache[event_uri] = {'cached_at': time.time(), 'info': event_info}
+    
+    print(f"Prefetched details for {len(prefetched)} of {len(event_uris)} events")
+    return prefetched
 
 def get_event_details_from_cache(event_uri, cached_details):
     """Get event details from cache with proper format handling."""
@@ -266,7 +381,14 @@ def get_ai_prompt(event_details):
     
     event_title = event_details.get('title', 'N/A')
     event_summary = event_details.get('summary', 'N/A')
-    event_concepts = [concept['label'] for concept in event_details.get('concepts', [])]
+    # Concept labels are plain strings in test data but {"eng": ...} dicts from the API
+    event_concepts = []
+    for concept in event_details.get('concepts') or ():
+        label = concept.get('label')
+        if isinstance(label, dict):
+            label = label.get('eng')
+        if label:
+            event_concepts.append(label)
     
     prompt = f"""
     Act as a senior financial journalist with a writing style that blends the analytical depth of The Wall Street Journal with the global perspective of The Financial Times.
@@ -291,6 +413,254 @@ def get_ai_prompt(event_details):
     """
     return prompt
 
+def fetch_event_details(er, event_uri, cached_event_details, prefetched=None):
+    """
+    Fetch title, summary and concepts for an event, falling back to the cache.
+    
+    Results already fetched by prefetch_event_details are used without a request.
+    
+    Raises:
+        ValueError: If no usable details are available from the API or cache.
+    """
+    print(f"  Fetching event details from EventRegistry...")
+    event_details = None
+    
+    try:
+        result = prefetched.get(event_uri) if prefetched else None
+        if result is None:
+            result = fetch_event_details_with_timeout(er, event_uri, timeout_seconds=30)
+        
+        if not result or not result.get('event'):
+            print(f"    API returned no event data, trying cache fallback...")
+            event_details = get_event_details_from_cache(event_uri, cached_event_details)
+            if not event_details:
+                raise ValueError(f"No event information found via API or cache for URI: {event_uri}")
+        else:
+            event_info = result['event']
+            print(f"    Raw event info keys: {list(event_info.keys())}")
+            
+            # Extract title and summary with better handling of nested structures
+            event_title = "No Title Provided"
+            event_summary = "No Summary Provided"
+            
+            # Handle title extraction (can be string or dict)
+            title_data = event_info.get("title", {})
+            if isinstance(title_data, dict):
+                event_title = title_data.get("eng", title_data.get("en", 
+                    list(title_data.values())[0] if title_data else "No Title Provided"))
+            elif isinstance(title_data, str):
+                event_title = title_data
+            
+            # Handle summary extraction (can be string or dict)
+            summary_data = event_info.get("summary", {})
+            if isinstance(summary_data, dict):
+                event_summary = summary_data.get("eng", summary_data.get("en",
+                    list(summary_data.values())[0] if summary_data else "No Summary Provided"))
+            elif isinstance(summary_data, str):
+                event_summary = summary_data
+            
+            # Validate that we have minimum required information
+            if event_title == "No Title Provided" and event_summary == "No Summary Provided":
+                # Try alternative field names
+                event_title = str(event_info.get("eventTitle", event_info.get("headline", "No Title Provided")))
+                event_summary = str(event_info.get("eventSummary", event_info.get("description", 
+                                                 event_info.get("snippet", "No Summary Provided"))))
+            
+            if event_title == "No Title Provided" and event_summary == "No Summary Provided":
+                print(f"    API data insufficient, trying cache fallback...")
+                event_details = get_event_details_from_cache(event_uri, cached_event_details)
+                if not event_details:
+                    available_fields = list(event_info.keys())
+                    print(f"    Available event fields: {available_fields}")
+                    raise ValueError(f"Event found but contains insufficient information. "
+                                   f"Available fields: {available_fields}. Event URI: {event_uri}")
+            else:
+                event_details = {
+                    "title": event_title,
+                    "summary": event_summary,
+                    "concepts": event_info.get("concepts", [])
+                }
+    
+    except Exception as api_error:
+        print(f"    API error: {api_error}")
+        print(f"    Trying cache fallback...")
+        event_details = get_event_details_from_cache(event_uri, cached_event_details)
+        if not event_details:
+            raise ValueError(f"Failed to get event details via API ({api_error}) and no cache available for URI: {event_uri}")
+    
+    if not event_details:
+        raise ValueError(f"No event details available from any source for URI: {event_uri}")
+    
+    return event_details
+
+def parse_article_json(text):
+    """Parses the article object from a Gemini response, ignoring code fences or commentary around it."""
+    start = text.find('{')
+    if start == -1:
+        raise ValueError(f"No JSON object in Gemini response: {text[:100]!r}")
+    try:
+        # raw_decode stops at the end of the object, so trailing text is ignored
+        article_data, _ = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        # Trailing commas are the usual slip in model-written JSON; only tried
+        # after strict parsing failed, as the pattern does not skip strings
+        text = _TRAILING_COMMA_RE.sub(r'\1', text)
+        article_data, _ = _JSON_DECODER.raw_decode(text, text.find('{'))
+    return article_data
+
+def make_gemini_client(api_key):
+    """Creates the Gemini client, retrying rate limits and transient server errors.
+    
+    Uses jittered exponential backoff before an event is marked as failed;
+    EventRegistry requests are already retried by its SDK.
+    """
+    from google import genai
+    from google.genai import types
+    
+    # The SDK retries 408, 429 and 5xx responses with these options; HTTP/2
+    # carries the concurrent calls of all worker threads over one connection
+    return genai.Client(api_key=api_key, http_options=types.HttpOptions(
+        client_args={'http2': True},
+        timeout=GEMINI_REQUEST_TIMEOUT * 1000,  # milliseconds
+        retry_options=types.HttpRetryOptions(
+            attempts=GEMINI_RETRY_ATTEMPTS,
+            initial_delay=GEMINI_RETRY_INITIAL,
+            max_delay=GEMINI_RETRY_MAXIMUM,
+            exp_base=2.0,
+        )))
+
+def make_rate_limiter(qpm):
+    """Returns a thread-safe function that blocks until the next of qpm requests per minute may start."""
+    interval = 60.0 / qpm
+    lock = threading.Lock()
+    next_slot = time.monotonic()
+    
+    def wait_for_slot():
+        nonlocal next_slot
+        # Slots are handed out under the lock, the sleep happens outside it
+        with lock:
+            now = time.monotonic()
+            slot = max(next_slot, now)
+            next_slot = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+    
+    return wait_for_slot
+
+def generate_article_data(client, event_details, rate_limit=None):
+    """Generates an article with Gemini and parses its JSON response. Safe to run in a worker thread."""
+    prompt = get_ai_prompt(event_details)
+    if rate_limit:
+        # Spacing requests keeps workers under the quota instead of retrying 429s
+        rate_limit()
+    response = client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
+    
+    return parse_article_json(response.text)
+
+def get_sample_article(event_uri):
+    """Returns the sample article used in test mode (no API calls)."""
+    print(f"  Using sample data for testing...")
+    event_details = {
+        "title": f"Bitcoin Mining Difficulty Reaches All-Time High ({event_uri})",
+        "summary": "Bitcoin mining difficulty has increased by 6.2% in the latest adjustment, marking the highest difficulty level in the network's history. This adjustment reflects the growing hash rate and increased competition among miners.",
+        "concepts": [
+            {"label": "Bitcoin mining"},
+            {"label": "Mining difficulty"},
+            {"label": "Hash rate"},
+            {"label": "Cryptocurrency"}
+        ]
+    }
+    print(f"  Event title: {event_details['title']}")
+    
+    # Generate a sample article in test mode
+    article_data = {
+        "headline": f"Bitcoin Mining Difficulty Surges to Record High as Network Security Strengthens (Event {event_uri})",
+        "summary": "Bitcoin's mining difficulty has reached an unprecedented level following a 6.2% upward adjustment, signaling robust network health and continued miner confidence despite recent market volatility.",
+        "key_points": [
+            "Mining difficulty increased by 6.2% to an all-time high",
+            "Rising hash rate indicates strong network security",
+            "Miner participation remains robust despite economic pressures",
+            "Adjustment reflects growing institutional mining operations"
+        ],
+        "body": "Bitcoin's mining difficulty has reached a new milestone, climbing 6.2% in the latest bi-weekly adjustment to establish an all-time high. This development underscores the remarkable resilience and growth of the Bitcoin network's computational security infrastructure.\n\nThe difficulty adjustment, an automated mechanism that recalibrates approximately every two weeks, responds to changes in the network's total hash rate. The current increase reflects sustained growth in mining participation, suggesting that despite recent market turbulence, miners remain committed to securing the network.\n\nIndustry analysts point to several factors driving this trend. Institutional mining operations continue to expand their capacity, while improvements in mining hardware efficiency enable operators to maintain profitability even as difficulty rises. This dynamic creates a positive feedback loop that strengthens network security while demonstrating the maturation of Bitcoin's infrastructure ecosystem.",
+        "tags": ["bitcoin-mining", "cryptocurrency", "network-security", "hash-rate", "difficulty-adjustment"],
+        "reflection_questions": [
+            "What does the continuous increase in mining difficulty suggest about institutional confidence in Bitcoin's long-term value proposition?",
+            "How might sustained high mining difficulty levels impact Bitcoin's energy consumption narrative and environmental considerations?"
+        ],
+        "calls_to_action": [
+            "Share your thoughts on how mining difficulty trends might influence Bitcoin's price trajectory in the comments below.",
+            "Stay informed about Bitcoin mining developments by following our comprehensive market analysis."
+        ]
+    }
+    print(f"  Sample article generated successfully")
+    return article_data
+
+def article_uri_hash(event_uri):
+    """Returns a short hash of an event URI that is stable across runs."""
+    return hashlib.blake2b(event_uri.encode('utf-8'), digest_size=4).hexdigest()
+
+def find_saved_articles(event_uris):
+    """Returns the event URIs whose article was saved by an earlier run, from one directory scan."""
+    uris_by_hash = {}
+    for event_uri in event_uris:
+        uris_by_hash.setdefault(article_uri_hash(event_uri), []).append(event_uri)
+    
+    saved = set()
+    with os.scandir(ARTICLES_DIR) as entries:
+        for entry in entries:
+            # Article filenames end in -<8 hex digit URI hash>.json; the hash
+            # only picks candidates, the URI stored in the article decides
+            name = entry.name
+            if not name.endswith('.json') or name[-14:-13] != '-':
+                continue
+            candidates = uris_by_hash.get(name[-13:-5])
+            if candidates:
+                article = read_json_file(entry.path, default_value={})
+                source_uri = article.get('source_event_uri') if isinstance(article, dict) else None
+                if source_uri in candidates:
+                    saved.add(source_uri)
+    return saved
+
+def save_article(event_uri, article_data, test_mode):
+    """Saves a generated article to the articles directory and returns its filename."""
+    headline = article_data.get("headline", f"article-{event_uri}")
+    # Create unique filename using headline and event URI
+    base_filename = sanitize_filename(headline)
+    # Remove .json extension and add URI hash for uniqueness
+    filename = f"{base_filename[:-5]}-{article_uri_hash(event_uri)}.json"
+    filepath = os.path.join(ARTICLES_DIR, filename)
+    
+    # Ensure the output format is easily uploadable
+    final_output = {
+        "source_event_uri": event_uri,
+        "generated_at": datetime.now().isoformat(),
+        "model_used": GEMINI_MODEL if not test_mode else "test-mode",
+        **article_data
+    }
+    write_json_file(filepath, final_output)
+    return filename
+
+def record_failed_event(event_uri, error, handled_events, failed_events):
+    """Logs a failed event, moves it to the failed list and out of the queue."""
+    print(f"Error processing event {event_uri}: {error}")
+    failed_events.append(make_failed_entry(event_uri, error))
+    handled_events.add(event_uri)
+
+def positive_int(value):
+    """argparse type for counts and rates that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def exit_on_sigterm(signum, frame):
+    """Turns SIGTERM (e.g. a cancelled workflow) into SystemExit so finally blocks run."""
+    sys.exit(128 + signum)
+
 # --- Main Logic ---
 
 def main():
@@ -298,9 +668,25 @@ def main():
     parser = argparse.ArgumentParser(description='Generate articles from Bitcoin mining news events')
     parser.add_argument('--test-mode', action='store_true',
                        help='Run in test mode with sample data (no API calls)')
+    parser.add_argument('--event-uris', nargs='+', metavar='URI',
+                       help='Generate articles for these event URIs instead of the queued events, '
+                            'regenerating any that were already processed')
+    parser.add_argument('--event-cache-ttl', type=int, default=86400,
+                       help='Reuse EventRegistry event details fetched within this many seconds '
+                            '(default: 86400, 0 disables)')
+    # Environment defaults go through type= as well, so a bad value gets a usage error
+    parser.add_argument('--concurrency', type=positive_int, default=os.getenv("ARTICLE_WORKERS", "4"),
+                       help='Maximum number of articles generated with Gemini at once '
+                            '(default: $ARTICLE_WORKERS or 4)')
+    parser.add_argument('--qpm', type=positive_int, default=os.getenv("GEMINI_QPM", str(GEMINI_QPM)),
+                       help='Maximum Gemini requests started per minute '
+                            f'(default: $GEMINI_QPM or {GEMINI_QPM})')
     
     args = parser.parse_args()
     
+    # Interrupted runs still flush the processed/failed lists and the queue
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
+    
     print("Starting article generation process...")
     
     if args.test_mode:
@@ -309,18 +695,25 @@ def main():
     # Ensure API keys are set (unless in test mode)
     if not args.test_mode and (not EVENT_REGISTRY_API_KEY or not GEMINI_API_KEY):
         print("Error: API keys for Event Registry or Gemini are not set in the .env file.")
-        print("Please set EVENT_REGISTRY_API_KEY and GEMINI_API_KEY environment variables.")
+        print("Please set EVENTREGISTRY_API_KEY and GEMINI_API_KEY environment variables.")
         print("Or use --test-mode to run with sample data.")
         sys.exit(1)
 
     # Initialize clients (unless in test mode)
     er = None
-    model = None
+    gemini_client = None
+    gemini_client_future = None
     if not args.test_mode:
         try:
-            er = EventRegistry(apiKey=EVENT_REGISTRY_API_KEY)
-            genai.configure(api_key=GEMINI_API_KEY)
-            model = genai.GenerativeModel('gemini-pro')
+            # Both clients are created once and keep their connections open:
+            # EventRegistry reuses one requests.Session, and the Gemini client
+            # shares one HTTP/2 connection between the worker threads.
+            # google.genai takes about half a second to import and set up, so
+            # that happens in the background while event details are fetched
+            client_executor = ThreadPoolExecutor(max_workers=1)
+            gemini_client_future = client_executor.submit(make_gemini_client, GEMINI_API_KEY)
+            client_executor.shutdown(wait=False)
+            er = make_event_registry(EVENT_REGISTRY_API_KEY, EVENT_REGISTRY_TIMEOUT, EVENT_REGISTRY_RETRIES)
         except Exception as e:
             print(f"Error initializing API clients: {e}")
             sys.exit(1)
@@ -332,13 +725,47 @@ def main():
         print(f"Error creating articles directory at {ARTICLES_DIR}: {e}")
         sys.exit(1)
 
-    # Load event URIs from the queue
-    event_uris = load_events_queue()
-    cached_event_details = load_cached_event_details()
+    # Load event URIs from the queue; URIs given on the command line are
+    # processed instead, and only leave the queue if they were queued
+    queued_uris, cached_event_details = load_events_queue()
+    event_uris = args.event_uris or queued_uris
     
     if cached_event_details:
         print(f"Loaded cached details for {len(cached_event_details)} events as fallback")
 
+    # Processed and failed lists are kept in memory for the whole run and
+    # written once at the end, even if processing is interrupted
+    processed_events = load_processed_events()
+    failed_events = load_failed_events()
+    
+    # Events published by an earlier run need no API calls, and a URI queued
+    # twice is generated once; drop both up front. URIs given with
+    # --event-uris are always generated again
+    requested_count = len(event_uris)
+    event_uris = list(dict.fromkeys(event_uris))
+    if args.event_uris:
+        regenerated = [uri for uri in event_uris if uri in processed_events]
+        if regenerated:
+            print(f"Regenerating {len(regenerated)} requested events that were already processed: "
+                  f"{', '.join(regenerated)}")
+    else:
+        event_uris = [uri for uri in event_uris if uri not in processed_events]
+    if len(event_uris) < requested_count:
+        print(f"Skipping {requested_count - len(event_uris)} events that were already processed or duplicated")
+    
+    # Articles saved by an earlier run that was interrupted before writing its
+    # processed list only need their bookkeeping; they are not counted as
+    # generated by this run
+    already_generated = set() if args.event_uris else find_saved_articles(event_uris)
+    if already_generated:
+        print(f"Skipping {len(already_generated)} events whose article already exists")
+        processed_events.update(already_generated)
+        save_processed_events(processed_events)
+        event_uris = [uri for uri in event_uris if uri not in already_generated]
+    
+    if not event_uris and not args.event_uris and queued_uris:
+        save_events_queue(event_uris)
+
     if not event_uris:
         print("No new events to process.")
         # Check if we should write a placeholder article
@@ -351,178 +778,137 @@ def main():
 
     print(f"Found {len(event_uris)} events to process.")
     
-    remaining_events = list(event_uris)  # Copy to modify while iterating
+    handled_events = set()  # Processed or failed this run; dropped from the queue at the end
     processed_count = 0
     failed_count = 0
-
-    for event_uri in event_uris:
-        print(f"\nProcessing event: {event_uri}")
-        
-        # Safety check: prevent processing test/placeholder URIs in production mode
-        if not args.test_mode and (event_uri.startswith("test-mode-") or 
-                                  event_uri.startswith("dry-run-") or 
-                                  event_uri == "placeholder"):
-            print(f"  ERROR: Detected test/placeholder URI '{event_uri}' but not in test mode!")
-            print(f"  This indicates the workflow incorrectly fell back to test data.")
-            print(f"  Use --test-mode flag explicitly if you want to process test data.")
-            raise ValueError(f"Production mode cannot process test URI: {event_uri}")
-        
+    # (event_uri, cache key, future article data) in queue order; Gemini calls are
+    # network-bound, so they run in worker threads while the next event's
+    # details are fetched here
+    pending_articles = deque()
+    
+    def save_finished_articles(wait):
+        """Saves generated articles in queue order, stopping at the first unfinished one unless wait is set."""
+        while pending_articles and (wait or pending_articles[0][2].done()):
+            save_generated_article(*pending_articles.popleft())
+    
+    def save_generated_article(event_uri, cache_key, article_future):
+        """Saves one generated article, or records its event as failed."""
+        nonlocal processed_count, failed_count, article_cache_updated
         try:
-            if args.test_mode:
-                # Use sample data in test mode
-                print(f"  Using sample data for testing...")
-                event_details = {
-                    "title": f"Bitcoin Mining Difficulty Reaches All-Time High ({event_uri})",
-                    "summary": "Bitcoin mining difficulty has increased by 6.2% in the latest adjustment, marking the highest difficulty level in the network's history. This adjustment reflects the growing hash rate and increased competition among miners.",
-                    "concepts": [
-                        {"label": "Bitcoin mining"},
-                        {"label": "Mining difficulty"},
-                        {"label": "Hash rate"},
-                        {"label": "Cryptocurrency"}
-                    ]
-                }
-                print(f"  Event title: {event_details['title']}")
-                
-                # Generate a sample article in test mode
-                article_data = {
-                    "headline": f"Bitcoin Mining Difficulty Surges to Record High as Network Security Strengthens (Event {event_uri})",
-                    "summary": "Bitcoin's mining difficulty has reached an unprecedented level following a 6.2% upward adjustment, signaling robust network health and continued miner confidence despite recent market volatility.",
-                    "key_points": [
-                        "Mining difficulty increased by 6.2% to an all-time high",
-                        "Rising hash rate indicates strong network security",
-                        "Miner participation remains robust despite economic pressures",
-                        "Adjustment reflects growing institutional mining operations"
-                    ],
-                    "body": "Bitcoin's mining difficulty has reached a new milestone, climbing 6.2% in the latest bi-weekly adjustment to establish an all-time high. This development underscores the remarkable resilience and growth of the Bitcoin network's computational security infrastructure.\n\nThe difficulty adjustment, an automated mechanism that recalibrates approximately every two weeks, responds to changes in the network's total hash rate. The current increase reflects sustained growth in mining participation, suggesting that despite recent market turbulence, miners remain committed to securing the network.\n\nIndustry analysts point to several factors driving this trend. Institutional mining operations continue to expand their capacity, while improvements in mining hardware efficiency enable operators to maintain profitability even as difficulty rises. This dynamic creates a positive feedback loop that strengthens network security while demonstrating the maturation of Bitcoin's infrastructure ecosystem.",
-                    "tags": ["bitcoin-mining", "cryptocurrency", "network-security", "hash-rate", "difficulty-adjustment"],
-                    "reflection_questions": [
-                        "What does the continuous increase in mining difficulty suggest about institutional confidence in Bitcoin's long-term value proposition?",
-                        "How might sustained high mining difficulty levels impact Bitcoin's energy consumption narrative and environmental considerations?"
-                    ],
-                    "calls_to_action": [
-                        "Share your thoughts on how mining difficulty trends might influence Bitcoin's price trajectory in the comments below.",
-                        "Stay informed about Bitcoin mining developments by following our comprehensive market analysis."
-                    ]
-                }
-                print(f"  Sample article generated successfully")
-            else:
-                # Real API mode
-                # 1. Try to fetch event details from Event Registry with timeout
-                print(f"  Fetching event details from EventRegistry...")
-                event_details = None
-                
-                try:
-                    result = fetch_event_details_with_timeout(er, event_uri, timeout_seconds=30)
-                    
-                    if not result or not result.get('event'):
-                        print(f"    API returned no event data, trying cache fallback...")
-                        event_details = get_event_details_from_cache(event_uri, cached_event_details)
-                        if not event_details:
-                            raise ValueError(f"No event information found via API or cache for URI: {event_uri}")
-                    else:
-                        event_info = result['event']
-                        print(f"    Raw event info keys: {list(event_info.keys())}")
-                        
-                        # Extract title and summary with better handling of nested structures
-                        event_title = "No Title Provided"
-                        event_summary = "No Summary Provided"
-                        
-                        # Handle title extraction (can be string or dict)
-                        title_data = event_info.get("title", {})
-                        if isinstance(title_data, dict):
-                            event_title = title_data.get("eng", title_data.get("en", 
-                                list(title_data.values())[0] if title_data else "No Title Provided"))
-                        elif isinstance(title_data, str):
-                            event_title = title_data
-                        
-                        # Handle summary extraction (can be string or dict)
-                        summary_data = event_info.get("summary", {})
-                        if isinstance(summary_data, dict):
-                            event_summary = summary_data.get("eng", summary_data.get("en",
-                                list(summary_data.values())[0] if summary_data else "No Summary Provided"))
-                        elif isinstance(summary_data, str):
-                            event_summary = summary_data
-                        
-                        # Validate that we have minimum required information
-                        if event_title == "No Title Provided" and event_summary == "No Summary Provided":
-                            # Try alternative field names
-                            event_title = str(event_info.get("eventTitle", event_info.get("headline", "No Title Provided")))
-                            event_summary = str(event_info.get("eventSummary", event_info.get("description", 
-                                                             event_info.get("snippet", "No Summary Provided"))))
-                        
-                        if event_title == "No Title Provided" and event_summary == "No Summary Provided":
-                            print(f"    API data insufficient, trying cache fallback...")
-                            event_details = get_event_details_from_cache(event_uri, cached_event_details)
-                            if not event_details:
-                                available_fields = list(event_info.keys())
-                                print(f"    Available event fields: {available_fields}")
-                                raise ValueError(f"Event found but contains insufficient information. "
-                                               f"Available fields: {available_fields}. Event URI: {event_uri}")
-                        else:
-                            event_details = {
-                                "title": event_title,
-                                "summary": event_summary,
-                                "concepts": event_info.get("concepts", [])
-                            }
-                
-                except Exception as api_error:
-                    print(f"    API error: {api_error}")
-                    print(f"    Trying cache fallback...")
-                    event_details = get_event_details_from_cache(event_uri, cached_event_details)
-                    if not event_details:
-                        raise ValueError(f"Failed to get event details via API ({api_error}) and no cache available for URI: {event_uri}")
-                
-                if not event_details:
-                    raise ValueError(f"No event details available from any source for URI: {event_uri}")
-                
-                print(f"  Event title: {event_details['title'][:100]}...")
-                print(f"  Event summary: {event_details['summary'][:100]}...")
-
-                # 2. Generate article using Gemini
-                print(f"  Generating article with Gemini AI...")
-                prompt = get_ai_prompt(event_details)
-                response = model.generate_content(prompt)
-                
-                # Clean up the response to get a valid JSON string
-                cleaned_response_text = response.text.strip().replace('```json', '').replace('```', '').strip()
-                article_data = json.loads(cleaned_response_text)
-                print(f"  Article generated successfully")
+            article_data = article_future.result()
+            if not args.test_mode:
+                print(f"  Article generated successfully for {event_uri}")
+                if cache_key is not None:
+                    article_cache[cache_key] = {'cached_at': time.time(), 'article': article_data}
+                    article_cache_updated = True
 
             # 3. Save the generated article
-            headline = article_data.get("headline", f"article-{event_uri}")
-            # Create unique filename using headline and event URI
-            base_filename = sanitize_filename(headline)
-            # Remove .json extension and add URI hash for uniqueness
-            uri_hash = str(hash(event_uri))[-6:]  # Last 6 chars of hash
-            filename = f"{base_filename[:-5]}-{uri_hash}.json"  # Remove .json and add hash
-            filepath = os.path.join(ARTICLES_DIR, filename)
-            
-            # Ensure the output format is easily uploadable
-            final_output = {
-                "source_event_uri": event_uri,
-                "generated_at": datetime.now().isoformat(),
-                "model_used": "gemini-pro" if not args.test_mode else "test-mode",
-                **article_data
-            }
-            write_json_file(filepath, final_output)
+            filename = save_article(event_uri, article_data, args.test_mode)
             print(f"Successfully generated and saved article: {filename}")
 
             # 4. Move URI to processed list
-            add_processed_event(event_uri)
-            remaining_events.remove(event_uri)
+            processed_events.add(event_uri)
+            handled_events.add(event_uri)
             processed_count += 1
 
         except Exception as e:
-            print(f"Error processing event {event_uri}: {e}")
-            # Move URI to failed list
-            add_failed_event(event_uri, str(e))
-            remaining_events.remove(event_uri)
+            record_failed_event(event_uri, e, handled_events, failed_events)
             failed_count += 1
-            # Continue to the next event
-            continue
 
-    # 5. Update the event queue file with any remaining events
-    save_events_queue(remaining_events)
+    # Articles already generated for the same event content, e.g. on retries;
+    # the cache file is only rewritten when an article was added
+    article_cache = load_article_cache()
+    article_cache_updated = False
+    
+    # One EventRegistry request per batch of events instead of one per event;
+    # test/placeholder URIs are left to the safety check in the loop
+    prefetched = {}
+    event_info_cache = {}
+    if not args.test_mode:
+        event_info_cache = load_event_info_cache(args.event_cache_ttl)
+        prefetched = prefetch_event_details(er, [
+            uri for uri in event_uris
+            if not (uri.startswith("test-mode-") or uri.startswith("dry-run-") or uri == "placeholder")
+        ], event_info_cache)
+        
+        try:
+            gemini_client = gemini_client_future.result()
+        except Exception as e:
+            print(f"Error initializing API clients: {e}")
+            sys.exit(1)
+
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+    rate_limit = make_rate_limiter(args.qpm)
+    try:
+        for event_uri in event_uris:
+            print(f"\nProcessing event: {event_uri}")
+        
+            # Safety check: prevent processing test/placeholder URIs in production mode
+            if not args.test_mode and (event_uri.startswith("test-mode-") or 
+                                      event_uri.startswith("dry-run-") or 
+                                      event_uri == "placeholder"):
+                print(f"  ERROR: Detected test/placeholder URI '{event_uri}' but not in test mode!")
+                print(f"  This indicates the workflow incorrectly fell back to test data.")
+                print(f"  Use --test-mode flag explicitly if you want to process test data.")
+                raise ValueError(f"Production mode cannot process test URI: {event_uri}")
+        
+            try:
+                cache_key = None
+                if args.test_mode:
+                    # Use sample data in test mode
+                    article_future = Future()
+                    article_future.set_result(get_sample_article(event_uri))
+                else:
+                    # 1. Fetch event details from Event Registry (or the cache)
+                    event_details = fetch_event_details(er, event_uri, cached_event_details, prefetched)
+                    print(f"  Event title: {event_details['title'][:100]}...")
+                    print(f"  Event summary: {event_details['summary'][:100]}...")
+
+                    # 2. Generate article using Gemini in the background,
+                    # unless this exact prompt has been answered before and
+                    # the event was not explicitly requested again
+                    cache_key = article_cache_key(event_uri, event_details)
+                    if cache_key in article_cache and not args.event_uris:
+                        print(f"  Using cached Gemini article")
+                        article_future = Future()
+                        article_future.set_result(article_cache[cache_key]['article'])
+                        cache_key = None  # Already cached
+                    else:
+                        print(f"  Generating article with Gemini AI...")
+                        article_future = executor.submit(generate_article_data, gemini_client, event_details, rate_limit)
+            except Exception as e:
+                record_failed_event(event_uri, e, handled_events, failed_events)
+                failed_count += 1
+                # Continue to the next event
+                continue
+        
+            pending_articles.append((event_uri, cache_key, article_future))
+            # Write articles that finished meanwhile instead of holding
+            # them until every event has been submitted
+            save_finished_articles(wait=False)
+
+        save_finished_articles(wait=True)
+    finally:
+        # On interruption, keep every article that already finished, in any
+        # order; nothing waits for calls still in flight or not yet started,
+        # since their events simply stay in the queue
+        for pending in pending_articles:
+            if pending[2].done() and not pending[2].cancelled():
+                save_generated_article(*pending)
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        # 5. Persist bookkeeping and update the event queue with any remaining events,
+        # all stamped with the same time
+        updated_at = datetime.now().isoformat()
+        save_processed_events(processed_events, updated_at)
+        save_failed_events(failed_events, updated_at)
+        remaining_events = [uri for uri in dict.fromkeys(queued_uris)
+                            if uri not in processed_events and uri not in handled_events]
+        save_events_queue(remaining_events, cached_event_details, updated_at)
+        if article_cache_updated:
+            save_article_cache(article_cache)
+        if not args.test_mode and args.event_cache_ttl > 0:
+            write_json_file(EVENT_INFO_CACHE_FILE, event_info_cache)
     
     print(f"\nArticle generation process finished.")
     print(f"Successfully processed: {processed_count} events")